@@ -1,5 +1,6 @@
 import random
-from math import floor
+from collections import OrderedDict
+from math import floor, ceil
 
 import pygame
 import math
@@ -7,7 +8,7 @@ import math
 # Initialize Pygame
 pygame.init()
 pygame.display.set_caption(
-    "Raycasting POC - (S)tats, (D)DA, (B)lobs, (R)ays, (G)rayscale, (T)ile Lines, (P)OV, (V)sync")
+    "Raycasting POC - (S)tats, (D)DA, (B)lobs, (R)ays, (G)rayscale, (T)ile Lines, (P)OV, (V)sync, (+/-) Zoom")
 use_dda = False
 show_blobs = False
 casted_rays = 120
@@ -17,6 +18,7 @@ show_pov = False
 font = pygame.Font(None, 55)
 show_stats = False
 vsync = False
+minimap_zoom_index = 2
 
 # Map
 # 0: Empty space, 8: random, 9: Yellow-Hidden wall
@@ -51,7 +53,12 @@ MAP_WIDTH = len(world_map[0])
 MAP_HEIGHT = len(world_map)
 TILE_SIZE = 32
 WALL_HEIGHT_SCALE_FACTOR = 35000  # Magic number to scale the wall height
-START_3D_VIEW = MAP_WIDTH * TILE_SIZE
+MINIMAP_WIDTH = 16 * TILE_SIZE  # Minimap viewport size on screen, independent of the map size
+MINIMAP_HEIGHT = 19 * TILE_SIZE
+MINIMAP_ZOOM_LEVELS = [0.25, 0.5, 1, 2]
+CHUNK_TILES = 8  # Minimap atlas chunk size in tiles
+CHUNK_CACHE_MARGIN = 1  # Extra chunks kept cached around the viewport on each side
+START_3D_VIEW = MINIMAP_WIDTH
 VIEWABLE_WIDTH = SCREEN_WIDTH - START_3D_VIEW
 FOV = math.pi / 3
 MAX_DEPTH = max(MAP_WIDTH, MAP_HEIGHT) * TILE_SIZE
@@ -71,44 +78,146 @@ number_of_checks = 0
 # Set up the display
 screen = pygame.display.set_mode(size=(SCREEN_WIDTH, SCREEN_HEIGHT), vsync=vsync)
 
+# Minimap is drawn on its own surface, so anything outside the viewport is clipped before it reaches the screen
+minimap = pygame.Surface((MINIMAP_WIDTH, MINIMAP_HEIGHT))
+minimap_offset_x = 0  # World position of the viewport's top-left corner
+minimap_offset_y = 0
+
+# Chunk atlas: LRU cache of pre-rendered map chunks keyed by (chunk_col, chunk_row, zoom), built lazily on first use.
+# Each entry is (surface, [(row, col)] of "random" tiles, which are recolored every frame).
+chunk_cache = OrderedDict()
+chunk_cache_zoom = None
+
+
+def minimap_zoom():
+    return MINIMAP_ZOOM_LEVELS[minimap_zoom_index]
+
+
+def to_minimap(x, y):
+    # Convert world coordinates to minimap surface coordinates
+    zoom = minimap_zoom()
+    return (x - minimap_offset_x) * zoom, (y - minimap_offset_y) * zoom
+
+
+def draw_tile(surface, x, y, size, color):
+    pygame.draw.rect(surface, "gray15", (x, y, size, size))
+    pygame.draw.rect(surface, color, (x, y, size - 2, size - 2))
+
+
+def build_chunk(chunk_col, chunk_row):
+    first_row, first_col = chunk_row * CHUNK_TILES, chunk_col * CHUNK_TILES
+    rows = min(CHUNK_TILES, MAP_HEIGHT - first_row)
+    cols = min(CHUNK_TILES, MAP_WIDTH - first_col)
+    chunk = pygame.Surface((cols * TILE_SIZE, rows * TILE_SIZE))
+    random_tiles = []
+    for row in range(first_row, first_row + rows):
+        for col in range(first_col, first_col + cols):
+            color = map_colors[world_map[row][col]]
+            if color == "random":
+                random_tiles.append((row, col))
+                continue
+            draw_tile(chunk, (col - first_col) * TILE_SIZE, (row - first_row) * TILE_SIZE, TILE_SIZE, color)
+    return chunk, random_tiles
+
+
+def chunk_cache_limit(zoom):
+    # Enough chunks to cover the viewport (which may straddle chunk borders) plus a margin on each side
+    chunk_pixels = CHUNK_TILES * TILE_SIZE * zoom
+    cols = ceil(MINIMAP_WIDTH / chunk_pixels) + 1 + 2 * CHUNK_CACHE_MARGIN
+    rows = ceil(MINIMAP_HEIGHT / chunk_pixels) + 1 + 2 * CHUNK_CACHE_MARGIN
+    return cols * rows
+
+
+def get_chunk(chunk_col, chunk_row, zoom):
+    global chunk_cache_zoom
+    if zoom != chunk_cache_zoom:
+        # Chunks scaled for the previous zoom level won't be used again soon
+        chunk_cache.clear()
+        chunk_cache_zoom = zoom
+
+    key = (chunk_col, chunk_row, zoom)
+    if key in chunk_cache:
+        chunk_cache.move_to_end(key)
+        return chunk_cache[key]
+
+    chunk, random_tiles = build_chunk(chunk_col, chunk_row)
+    if zoom != 1:
+        size = (int(chunk.get_width() * zoom), int(chunk.get_height() * zoom))
+        chunk = pygame.transform.scale(chunk, size)
+    chunk_cache[key] = (chunk, random_tiles)
+    while len(chunk_cache) > chunk_cache_limit(zoom):
+        chunk_cache.popitem(last=False)
+    return chunk_cache[key]
+
+
+def update_minimap_viewport():
+    # Center the viewport on the player, clamped to the map edges. Maps smaller than the viewport are centered.
+    global minimap_offset_x, minimap_offset_y
+    zoom = minimap_zoom()
+    view_width = MINIMAP_WIDTH / zoom
+    view_height = MINIMAP_HEIGHT / zoom
+    map_width = MAP_WIDTH * TILE_SIZE
+    map_height = MAP_HEIGHT * TILE_SIZE
+
+    if map_width <= view_width:
+        minimap_offset_x = (map_width - view_width) / 2
+    else:
+        minimap_offset_x = min(max(player_x - view_width / 2, 0), map_width - view_width)
+    if map_height <= view_height:
+        minimap_offset_y = (map_height - view_height) / 2
+    else:
+        minimap_offset_y = min(max(player_y - view_height / 2, 0), map_height - view_height)
+
+    # Snap to whole minimap pixels so overlays stay aligned with the (integer positioned) chunk blits
+    minimap_offset_x = round(minimap_offset_x * zoom) / zoom
+    minimap_offset_y = round(minimap_offset_y * zoom) / zoom
+
 
 def draw_livemap():
-    for row in range(MAP_HEIGHT):
-        for col in range(MAP_WIDTH):
-            if map_colors[world_map[row][col]] == "random":
-                color = random.choices(range(255), k=3)
-            else:
-                color = map_colors[world_map[row][col]]
-            pygame.draw.rect(
-                screen,
-                "gray15",
-                (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            )
-            pygame.draw.rect(
-                screen,
-                color,
-                (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE - 2, TILE_SIZE - 2)
-            )
+    update_minimap_viewport()
+    minimap.fill("black")
+    zoom = minimap_zoom()
+    chunk_size = CHUNK_TILES * TILE_SIZE
+
+    # Only blit the chunks that intersect the viewport
+    first_chunk_col = max(int(minimap_offset_x // chunk_size), 0)
+    first_chunk_row = max(int(minimap_offset_y // chunk_size), 0)
+    last_chunk_col = min(int((minimap_offset_x + MINIMAP_WIDTH / zoom) // chunk_size), (MAP_WIDTH - 1) // CHUNK_TILES)
+    last_chunk_row = min(int((minimap_offset_y + MINIMAP_HEIGHT / zoom) // chunk_size),
+                         (MAP_HEIGHT - 1) // CHUNK_TILES)
+
+    for chunk_row in range(first_chunk_row, last_chunk_row + 1):
+        for chunk_col in range(first_chunk_col, last_chunk_col + 1):
+            chunk, random_tiles = get_chunk(chunk_col, chunk_row, zoom)
+            minimap.blit(chunk, to_minimap(chunk_col * chunk_size, chunk_row * chunk_size))
+            for row, col in random_tiles:
+                draw_tile(minimap, *to_minimap(col * TILE_SIZE, row * TILE_SIZE), TILE_SIZE * zoom,
+                          random.choices(range(255), k=3))
 
 
 def draw_player():
+    player_pos = to_minimap(player_x, player_y)
     # Draw player
-    pygame.draw.circle(screen, "red", (int(player_x), int(player_y)), 8)
+    pygame.draw.circle(minimap, "red", player_pos, 8)
     # Draw player direction
-    player_pov_x = player_x + math.cos(player_angle) * 50
-    player_pov_y = player_y + math.sin(player_angle) * 50
-    pygame.draw.line(screen, "red", (player_x, player_y), (player_pov_x, player_pov_y), 2)
+    player_pov_x = player_pos[0] + math.cos(player_angle) * 50
+    player_pov_y = player_pos[1] + math.sin(player_angle) * 50
+    pygame.draw.line(minimap, "red", player_pos, (player_pov_x, player_pov_y), 2)
+
+
+def blit_minimap():
+    screen.blit(minimap, dest=(0, 0))
 
 
 def draw_blob(target_x, target_y):
-    pygame.draw.circle(screen, "green", (target_x, target_y), 3)
+    pygame.draw.circle(minimap, "green", to_minimap(target_x, target_y), 3)
 
 
 def draw_ray(player_x, player_y, target_x, target_y, ray):
     if ray == casted_rays // 2 and show_pov:  # Draw POV ray
-        pygame.draw.line(screen, "red", (player_x, player_y), (target_x, target_y), 2)
+        pygame.draw.line(minimap, "red", to_minimap(player_x, player_y), to_minimap(target_x, target_y), 2)
     elif ray % 20 == 0:  # Draw every 20th ray
-        pygame.draw.line(screen, "yellow", (player_x, player_y), (target_x, target_y))
+        pygame.draw.line(minimap, "yellow", to_minimap(player_x, player_y), to_minimap(target_x, target_y))
 
 
 def set_wall_color(wall_height, target_x, target_y, row, col, side):
@@ -416,9 +525,12 @@ def calc_fps():
 
 def handle_events():
     global use_dda, show_blobs, running, casted_rays, grayscale, show_stats, show_tile_lines, show_pov, vsync, screen
+    global minimap_zoom_index
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        if event.type == pygame.MOUSEWHEEL and minimap.get_rect().collidepoint(pygame.mouse.get_pos()):
+            minimap_zoom_index = min(max(minimap_zoom_index + event.y, 0), len(MINIMAP_ZOOM_LEVELS) - 1)
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_d:
                 use_dda = not use_dda
@@ -453,6 +565,12 @@ def handle_events():
                 vsync = not vsync
                 screen = pygame.display.set_mode(size=(SCREEN_WIDTH, SCREEN_HEIGHT), vsync=vsync)
 
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                minimap_zoom_index = min(minimap_zoom_index + 1, len(MINIMAP_ZOOM_LEVELS) - 1)
+
+            if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                minimap_zoom_index = max(minimap_zoom_index - 1, 0)
+
 
 def update_text():
     text = f"""
@@ -462,11 +580,12 @@ Stats for Nerds:
    Checks per Frame: {number_of_checks}
    Rays: {casted_rays}
    Vsync: {vsync}
+   Minimap Zoom: {minimap_zoom()}x
    
    DDA: {use_dda}
 """
     text_surface = font.render(text, True, "white")
-    screen.blit(text_surface, dest=(0, MAP_HEIGHT * TILE_SIZE))
+    screen.blit(text_surface, dest=(0, MINIMAP_HEIGHT))
 
 
 while running:
@@ -476,6 +595,7 @@ while running:
     draw_livemap()
     cast_rays()
     draw_player()
+    blit_minimap()
     if show_stats:
         locked_fps, theoretical_fps = calc_fps()
         update_text()